@@ -1,15 +1,139 @@
 #!/usr/bin/env python3
+import errno
 import json
 import os
+import re
+import resource
 import sys
-from dataclasses import dataclass
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
 from pathlib import Path
 
 CPU_PATH = "/sys/devices/system/cpu"
 NODE_PATH = "/sys/devices/system/node"
 
+# Concurrent readers for sysfs sweeps; individual reads can stall for over a ms
+_SYSFS_WORKERS = 32
 
-@dataclass
+# Path of a JSON file persisting the topology across runs (opt-in, like hwloc's
+# HWLOC_TOPOLOGY_CACHE). Entries written on another host, or for other sysfs roots,
+# are ignored.
+TOPOLOGY_CACHE_ENV = "MPMC_TOPOLOGY_CACHE"
+
+_HOSTNAME = os.uname().nodename
+
+# Numbered sysfs entries; [0-9] rather than \d, which also matches non-ASCII digits
+_CPU_RE = re.compile(r"cpu([0-9]+)")
+_NODE_RE = re.compile(r"node([0-9]+)")
+_INDEX_RE = re.compile(r"index([0-9]+)")
+
+
+def _raise_if_out_of_fds(e: OSError) -> None:
+    """Running out of fds is not a missing attribute: a sweep must fail, not skip CPUs"""
+    if e.errno in (errno.EMFILE, errno.ENFILE):
+        raise RuntimeError(f"Out of file descriptors while reading sysfs: {str(e)}") from e
+
+
+def _open_fd(path: str, flags: int, dir_fd: int | None = None) -> int:
+    """os.open with O_CLOEXEC; EMFILE/ENFILE become RuntimeError instead of an OSError"""
+    try:
+        return os.open(path, flags | os.O_CLOEXEC, dir_fd=dir_fd)
+    except OSError as e:
+        _raise_if_out_of_fds(e)
+        raise
+
+
+def _read_sysfs(path: str, dir_fd: int | None = None) -> bytes:
+    """Reads a sysfs attribute in one unbuffered read; the payload is never decoded.
+
+    sysfs attributes fit in a page, and ``int()``/``split()`` work on bytes directly,
+    so the buffered/text ``io`` stack only adds overhead per file. With @p dir_fd the
+    path is resolved relative to that directory (openat), skipping the full walk.
+    """
+    fd = _open_fd(path, os.O_RDONLY, dir_fd)
+    try:
+        return os.read(fd, 4096)
+    finally:
+        os.close(fd)
+
+
+def _open_dir(path: str) -> int:
+    """Opens a directory to serve as dir_fd for several reads beneath it"""
+    return _open_fd(path, os.O_RDONLY | os.O_DIRECTORY)
+
+
+@contextmanager
+def _scandir(path: str | int) -> Iterator[Iterator[os.DirEntry[str]]]:
+    """os.scandir, failing hard (like _open_fd) when out of fds"""
+    try:
+        entries = os.scandir(path)
+    except OSError as e:
+        _raise_if_out_of_fds(e)
+        raise
+    with entries:
+        yield entries
+
+
+def _numbered_entries(path: str | int, pattern: re.Pattern[str]) -> list[int]:
+    """Returns N for every entry of @p path whose whole name matches @p pattern"""
+    with _scandir(path) as entries:
+        return [
+            int(m.group(1))
+            for m in map(pattern.fullmatch, (entry.name for entry in entries))
+            if m
+        ]
+
+
+def _write_file(path: str, text: str) -> None:
+    """Writes a whole generated file with a single os.write (looping only on short writes)"""
+    payload = memoryview(text.encode())
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o666)
+    try:
+        while payload:
+            payload = payload[os.write(fd, payload):]
+    finally:
+        os.close(fd)
+
+
+def _atoi(data: bytes) -> int:
+    """Parses the leading decimal digits of a sysfs value, stopping at '-', ',' or '\\n'.
+
+    Cache ids are one to three digits, where this beats split()+int() and needs no
+    intermediate lists; a range like ``0-1`` yields its first id.
+    """
+    n = 0
+    end = 0
+    for c in data:
+        if not 0x30 <= c <= 0x39:
+            break
+        n = n * 10 + c - 0x30
+        end += 1
+    if not end:
+        raise ValueError(f"no leading integer in {data!r}")
+    return n
+
+
+def _parse_cpu_ranges(data: bytes) -> list[int]:
+    """Parses the sysfs list grammar (e.g. ``0-7,16-23,32``) into a flat list of ids.
+
+    Used for node ``cpulist``, ``has_memory`` and ``thread_siblings_list``, which all
+    mix single ids and inclusive ranges freely.
+    """
+    ids: list[int] = []
+    for part in data.strip().split(b","):
+        if not part:
+            continue
+        first, dash, last = part.partition(b"-")
+        if dash:
+            ids.extend(range(int(first), int(last) + 1))
+        else:
+            ids.append(int(first))
+    return ids
+
+
+@dataclass(slots=True)
 class CPUInfo:
     """Data class to represent CPU information"""
 
@@ -21,7 +145,7 @@ class CPUInfo:
     package_id: int
 
 
-@dataclass
+@dataclass(slots=True)
 class NodeInfo:
     """Data class to represent NUMA node information"""
 
@@ -34,126 +158,316 @@ class NodeInfo:
 class SystemTopology:
     """Class to encapsulate system topology operations"""
 
-    def __init__(self) -> None:
-        self.cpu_path: Path = Path(CPU_PATH)
-        self.node_path: Path = Path(NODE_PATH)
+    def __init__(self, cpu_path: str = CPU_PATH, node_path: str = NODE_PATH) -> None:
+        self.cpu_path: Path = Path(cpu_path)
+        self.node_path: Path = Path(node_path)
+        # Attribute paths are built as plain strings from these: os.open takes str,
+        # and a Path join allocates a new PurePosixPath per component
+        self.cpu_path_str: str = str(self.cpu_path)
+        self.node_path_str: str = str(self.node_path)
+        # Per-CPU topology is static for the process lifetime; get_cpu_info primes
+        # these so later clustering passes issue no sysfs reads at all.
+        self._cache_info_cache: dict[int, list[int]] = {}
+        self._siblings_cache: dict[int, list[int]] = {}
+        self._node_of_cpu_cache: dict[int, int | None] = {}
+        # Inside open(): fds of the always-read attributes, keyed by absolute path,
+        # up to _fds_max of them (the rest are opened per read as usual)
+        self._fds: dict[str, int] | None = None
+        self._fds_max: int = 0
+        # Whole-topology results, optionally persisted to $MPMC_TOPOLOGY_CACHE
+        self._cache_file: str | None = os.environ.get(TOPOLOGY_CACHE_ENV) or None
+        self._cpu_info: list[CPUInfo] | None = None
+        self._nodes_info: list[NodeInfo] | None = None
+        self._load_cache_file()
+
+    def _cache_key(self) -> list[str]:
+        """What a cache file must have been written for: this host and these sysfs roots"""
+        return [_HOSTNAME, self.cpu_path_str, self.node_path_str]
+
+    def _load_cache_file(self) -> None:
+        """Restores cpu/node info saved by an earlier run on this host, if any"""
+        if self._cache_file is None:
+            return
+        try:
+            with open(self._cache_file) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("key") != self._cache_key():
+            return
+
+        # Parsed into locals first, so a malformed entry leaves nothing half-loaded
+        try:
+            cpus = [CPUInfo(**cpu) for cpu in data["cpus"]] if "cpus" in data else None
+            nodes = (
+                [
+                    NodeInfo(**{**node, "cores_list": [tuple(c) for c in node["cores_list"]]})
+                    for node in data["nodes"]
+                ]
+                if "nodes" in data
+                else None
+            )
+        except (TypeError, KeyError):
+            print(f"Warning: Ignoring malformed topology cache {self._cache_file}")
+            return
+
+        if cpus is not None:
+            self._cpu_info = cpus
+            for cpu in cpus:
+                self._siblings_cache[cpu.logical_id] = cpu.siblings
+                self._cache_info_cache[cpu.logical_id] = cpu.cache_ids
+                self._node_of_cpu_cache[cpu.logical_id] = cpu.numa_node
+        self._nodes_info = nodes
+
+    def _save_cache_file(self) -> None:
+        """Persists whatever topology has been computed so far"""
+        if self._cache_file is None:
+            return
+        data: dict[str, object] = {"key": self._cache_key()}
+        if self._cpu_info is not None:
+            data["cpus"] = [asdict(cpu) for cpu in self._cpu_info]
+        if self._nodes_info is not None:
+            data["nodes"] = [asdict(node) for node in self._nodes_info]
+        try:
+            with open(self._cache_file, "w") as f:
+                json.dump(data, f)
+        except OSError as e:
+            print(f"Warning: Could not write topology cache {self._cache_file}: {str(e)}")
+
+    @contextmanager
+    def open(self) -> Iterator["SystemTopology"]:
+        """
+        Keeps the per-CPU attributes every pass reads (thread siblings, core and
+        package ids, cache ids) open until the block exits, so passes after refresh()
+        re-read them with a single pread instead of open/read/close. At most half the
+        soft RLIMIT_NOFILE is held; past that, attributes are opened per read.
+        Only worth it for long-lived users; the CLI reads once.
+        Not re-entrant: a nested block would lose track of the outer block's fds.
+        """
+        if self._fds is not None:
+            raise RuntimeError("SystemTopology.open() is already active")
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        self._fds_max = sys.maxsize if soft == resource.RLIM_INFINITY else soft // 2
+        self._fds = {}
+        try:
+            yield self
+        finally:
+            fds, self._fds = self._fds, None
+            for fd in fds.values():
+                os.close(fd)
+
+    def refresh(self) -> None:
+        """Forgets every computed result, so the next query reads sysfs again"""
+        self._cache_info_cache.clear()
+        self._siblings_cache.clear()
+        self._node_of_cpu_cache.clear()
+        self._cpu_info = self._nodes_info = None
+
+    def _kept_fd(self, path: str, dir_fd: int | None, keep: str) -> int | None:
+        """The fd kept for @p keep, opening @p path if needed; None once the table is full"""
+        assert self._fds is not None
+        fd = self._fds.get(keep)
+        if fd is None:
+            if len(self._fds) >= self._fds_max:
+                return None
+            fd = _open_fd(path, os.O_RDONLY, dir_fd)
+            # Reader threads may race to open the same attribute; keep one fd
+            kept = self._fds.setdefault(keep, fd)
+            if kept != fd:
+                os.close(fd)
+            fd = kept
+        return fd
+
+    def _read_attr(
+        self, path: str, dir_fd: int | None = None, keep: str | None = None
+    ) -> bytes:
+        """
+        _read_sysfs, or inside open() a pread on the fd kept under the absolute path
+        @p keep; only the always-read attributes pass one.
+        """
+        if self._fds is not None and keep is not None:
+            fd = self._kept_fd(path, dir_fd, keep)
+            if fd is not None:
+                return os.pread(fd, 4096, 0)
+        return _read_sysfs(path, dir_fd)
 
     def get_cpu_info(self) -> list[CPUInfo]:
         """
         Returns a list of CPUInfo objects containing information about each CPU
         including physical core id, logical id, cache ids, etc.
+        The topology is static, so it is read once per instance.
         """
+        if self._cpu_info is None:
+            self._cpu_info = self._compute_cpu_info()
+            self._save_cache_file()
+        # Copies: the siblings and cache_ids lists are shared with the lookups that
+        # clustering reads, so a caller editing them must not reach those
+        return [
+            replace(cpu, siblings=list(cpu.siblings), cache_ids=list(cpu.cache_ids))
+            for cpu in self._cpu_info
+        ]
+
+    def _compute_cpu_info(self) -> list[CPUInfo]:
         try:
-            cpu_entries = [
-                f
-                for f in self.cpu_path.iterdir()
-                if f.name.startswith("cpu") and f.name[3:].isdigit()
-            ]
+            cpu_nbrs = _numbered_entries(self.cpu_path_str, _CPU_RE)
         except (OSError, FileNotFoundError):
-            print(f"Error: Unable to access {CPU_PATH}")
+            print(f"Error: Unable to access {self.cpu_path}")
             return []
 
-        cpu_list: list[CPUInfo] = []
+        # Every attribute read can stall on sysfs, so CPUs are read concurrently;
+        # os.read releases the GIL, letting the stalls overlap.
+        with ThreadPoolExecutor(max_workers=_SYSFS_WORKERS) as ex:
+            results = ex.map(self._read_cpu, cpu_nbrs)
+            cpu_list = [cpu for cpu in results if cpu is not None]
 
-        for cpu_entry in cpu_entries:
-            cpu_nbr = int(cpu_entry.name[3:])
-            topology_dir = cpu_entry / "topology"
+        cpu_list.sort(key=lambda x: x.logical_id)
+        return cpu_list
 
+    def _read_cpu(self, cpu_nbr: int) -> CPUInfo | None:
+        """Reads the topology attributes of one logical CPU, or None if incomplete"""
+        try:
+            # The kernel walks the topology path once; the attributes are opened
+            # relative to it
+            topology = f"{self.cpu_path_str}/cpu{cpu_nbr}/topology"
+            topology_fd = _open_dir(topology)
             try:
                 # Read siblings list
-                siblings_file = topology_dir / "thread_siblings_list"
-                with siblings_file.open("r") as f:
-                    siblings = [
-                        int(x) for x in f.read().strip().split(",") if x.strip()
-                    ]
+                siblings = _parse_cpu_ranges(
+                    self._read_attr(
+                        "thread_siblings_list",
+                        topology_fd,
+                        keep=f"{topology}/thread_siblings_list",
+                    )
+                )
+                self._siblings_cache[cpu_nbr] = siblings
 
                 # Read the core_id
-                core_id_file = topology_dir / "core_id"
-                with core_id_file.open("r") as f:
-                    core_id = int(f.read().strip())
-
-                # Read the package_id
-                package_id_file = topology_dir / "physical_package_id"
-                with package_id_file.open("r") as f:
-                    package_id = int(f.read().strip())
-
-                # Gather cache and numa information
-                cache_ids = self._get_cache_info(cpu_nbr)
-                numa_node = self._get_node_of_cpu(cpu_nbr)
-
-                cpu_info = CPUInfo(
-                    logical_id=cpu_nbr,
-                    core_id=core_id,
-                    siblings=siblings,
-                    numa_node=numa_node,
-                    cache_ids=cache_ids,
-                    package_id=package_id,
+                core_id = int(
+                    self._read_attr("core_id", topology_fd, keep=f"{topology}/core_id")
                 )
-                cpu_list.append(cpu_info)
 
-            except (IOError, FileNotFoundError, ValueError) as e:
-                print(
-                    f"Warning: Could not read complete information for {cpu_entry.name}: {str(e)}"
+                # Read the package_id
+                package_id = int(
+                    self._read_attr(
+                        "physical_package_id",
+                        topology_fd,
+                        keep=f"{topology}/physical_package_id",
+                    )
                 )
-                continue
+            finally:
+                os.close(topology_fd)
+
+            # Gather cache and numa information
+            cache_ids = self._get_cache_info(cpu_nbr)
+            numa_node = self._get_node_of_cpu(cpu_nbr)
+
+            return CPUInfo(
+                logical_id=cpu_nbr,
+                core_id=core_id,
+                siblings=siblings,
+                numa_node=numa_node,
+                cache_ids=cache_ids,
+                package_id=package_id,
+            )
 
-        cpu_list.sort(key=lambda x: x.logical_id)
-        return cpu_list
+        except (IOError, FileNotFoundError, ValueError) as e:
+            print(
+                f"Warning: Could not read complete information for cpu{cpu_nbr}: {str(e)}"
+            )
+            return None
 
     def _get_node_of_cpu(self, logical_id: int) -> int | None:
         """Returns the numa node of the given logical CPU ID"""
+        if logical_id not in self._node_of_cpu_cache:
+            self._node_of_cpu_cache[logical_id] = self._read_node_of_cpu(logical_id)
+        return self._node_of_cpu_cache[logical_id]
+
+    def _read_node_of_cpu(self, logical_id: int) -> int | None:
         try:
-            cpu_dir = self.cpu_path / f"cpu{logical_id}"
-            for file_path in cpu_dir.iterdir():
-                if file_path.name.startswith("node") and file_path.name[4:].isdigit():
-                    return int(file_path.name[4:])
+            # scandir yields bare names, and the scan stops at the first nodeN link
+            with _scandir(f"{self.cpu_path_str}/cpu{logical_id}") as entries:
+                for entry in entries:
+                    m = _NODE_RE.fullmatch(entry.name)
+                    if m:
+                        return int(m.group(1))
         except (IOError, FileNotFoundError):
             pass
         return None
 
     def _get_cpus_logical_ids(self, logical_id: int) -> list[int]:
         """Returns the list of logical ids of the CPUs (SMT siblings) of the given core"""
+        if logical_id not in self._siblings_cache:
+            self._siblings_cache[logical_id] = self._read_cpus_logical_ids(logical_id)
+        return self._siblings_cache[logical_id]
+
+    def _read_cpus_logical_ids(self, logical_id: int) -> list[int]:
         try:
-            path = (
-                self.cpu_path / f"cpu{logical_id}" / "topology" / "thread_siblings_list"
-            )
-            with path.open("r") as f:
-                return [int(i) for i in f.read().strip().split(",")]
-        except (IOError, FileNotFoundError):
+            path = f"{self.cpu_path_str}/cpu{logical_id}/topology/thread_siblings_list"
+            return _parse_cpu_ranges(self._read_attr(path, keep=path))
+        except (IOError, FileNotFoundError, ValueError):
             return []
 
     def _get_cache_info(self, logical_id: int) -> list[int]:
-            """Returns the list of cache_ids for all cache levels of a given CPU"""
-            cache_ids: list[int] = []
+        """Returns the list of cache_ids for all cache levels of a given CPU"""
+        if logical_id not in self._cache_info_cache:
+            self._cache_info_cache[logical_id] = self._read_cache_info(logical_id)
+        return self._cache_info_cache[logical_id]
 
-            try:
-                cache_path = self.cpu_path / f"cpu{logical_id}" / "cache"
-                if not cache_path.exists():
-                    return []
+    def _read_cache_info(self, logical_id: int) -> list[int]:
+        cache_ids: list[int] = []
 
+        try:
+            # A CPU without a cache directory has no cache ids
+            cache_path = f"{self.cpu_path_str}/cpu{logical_id}/cache"
+            cache_fd = _open_dir(cache_path)
+            try:
                 # Get all cache index directories and sort them
-                cache_dirs: list[Path] = [
-                    d
-                    for d in cache_path.iterdir()
-                    if d.name.startswith("index") and d.name[5:].isdigit()
-                ]
-                cache_dirs.sort(key=lambda x: int(x.name[5:]))
+                cache_indices = sorted(_numbered_entries(cache_fd, _INDEX_RE))
 
                 # Read cache IDs for each level
-                for cache_dir in cache_dirs:
-                    id_file = cache_dir / "id"
-                    if id_file.exists():
-                        with id_file.open("r") as f:
-                            raw_id = f.read().strip()
-                            # Fix: Handle ranges like '0-1' or '2'
-                            # We take the first part of the range to use as a group identifier
-                            clean_id = raw_id.split('-')[0].split(',')[0]
-                            cache_ids.append(int(clean_id))
-
-            except (IOError, FileNotFoundError, ValueError):
-                pass
-
-            return cache_ids
+                for index in cache_indices:
+                    try:
+                        raw_id = self._read_attr(
+                            f"index{index}/id", cache_fd, keep=f"{cache_path}/index{index}/id"
+                        )
+                    except FileNotFoundError:
+                        continue
+                    # Fix: Handle ranges like '0-1' or '2'
+                    # We take the first part of the range to use as a group identifier
+                    cache_ids.append(_atoi(raw_id))
+            finally:
+                os.close(cache_fd)
+
+        except (IOError, FileNotFoundError, ValueError):
+            pass
+
+        return cache_ids
+
+    def _read_shared_cpus(self, logical_id: int, cache_level: int) -> set[int]:
+        """Returns the CPUs sharing the cache behind _get_cache_info(logical_id)[cache_level]"""
+        try:
+            cache_fd = _open_dir(f"{self.cpu_path_str}/cpu{logical_id}/cache")
+            try:
+                # Same level numbering as _read_cache_info: index dirs with an id, in
+                # order; only the ones up to the requested level are looked at
+                level = -1
+                for index in sorted(_numbered_entries(cache_fd, _INDEX_RE)):
+                    try:
+                        os.stat(f"index{index}/id", dir_fd=cache_fd)
+                    except FileNotFoundError:
+                        continue
+                    level += 1
+                    if level == cache_level:
+                        shared_list = self._read_attr(f"index{index}/shared_cpu_list", cache_fd)
+                        return set(_parse_cpu_ranges(shared_list))
+            finally:
+                os.close(cache_fd)
+
+        except (IOError, FileNotFoundError, ValueError):
+            pass
+
+        return set()
+
     def get_nodes_info(self) -> list[NodeInfo]:
         """
         Returns a list of NodeInfo objects containing:
@@ -161,88 +475,81 @@ class SystemTopology:
         - memory: bool (whether the node has memory)
         - cores_list: list of CPUs (logical IDs)
         - distance: list of distances to other nodes
+        The topology is static, so it is read once per instance.
         """
+        if self._nodes_info is None:
+            self._nodes_info = self._compute_nodes_info()
+            self._save_cache_file()
+        # Copies: optimize_cache_nodes reassigns cores_list on the nodes it is given,
+        # which must not reorder (or drop cores from) the cached sysfs view
+        return [replace(node) for node in self._nodes_info]
+
+    def _compute_nodes_info(self) -> list[NodeInfo]:
         memory_nodes: set[int]
 
         try:
             # Get nodes with memory
-            memory_file = self.node_path / "has_memory"
-            with memory_file.open("r") as f:
-                content = f.read().strip()
-                if not ("," in content or "-" in content):
-                    memory_nodes = {int(content)}
-                memory_nodes = {int(i) for i in content.split("," if "," in content else "-")}
-        except (IOError, FileNotFoundError, Exception):
+            memory_nodes = set(
+                _parse_cpu_ranges(self._read_attr(f"{self.node_path_str}/has_memory"))
+            )
+        except (IOError, FileNotFoundError, ValueError):
             print("Warning: Could not read memory node information")
             memory_nodes = set()
 
-        nodes: list[NodeInfo] = []
-
         try:
-            node_dirs = [
-                d
-                for d in self.node_path.iterdir()
-                if d.name.startswith("node") and d.name[4:].isdigit()
-            ]
+            node_ids = _numbered_entries(self.node_path_str, _NODE_RE)
         except (OSError, FileNotFoundError):
-            print(f"Error: Unable to access {NODE_PATH}")
+            print(f"Error: Unable to access {self.node_path}")
             return []
 
-        for node_dir in node_dirs:
-            node_id = int(node_dir.name[4:])
-
-            try:
-                # Get CPU list for this node
-                cpus_file = node_dir / "cpulist"
-                with cpus_file.open("r") as f:
-                    cpus_data = f.read().strip()
-
-                # Parse CPU range or list
-                if "-" in cpus_data:
-                    cpus: list[int] = []
-                    ranges: list[str] = [cpus_data] if ',' not in cpus_data else cpus_data.split(",")
-
-                    for s in ranges:
-                        start, end = map(int, s.split("-"))
-                        cpus += list(range(start, end + 1))
-                else: # only a list of cores
-                    cpus = [int(i) for i in cpus_data.split(",") if i.strip()]
-
-                # Get distance matrix
-                distance_file = node_dir / "distance"
-                with distance_file.open("r") as f:
-                    distances = [int(i) for i in f.read().strip().split()]
-
-                # Get logical IDs for each core (including SMT siblings)
-                cores_list: list[tuple[int, ...]] = []
-                for core in cpus:
-                    siblings = self._get_cpus_logical_ids(core)
-                    if siblings:
-                        cores_list.append(tuple(siblings))
-
-                # Remove duplicates while preserving order
-                seen: set[tuple[int, ...]] = set()
-                unique_cores: list[tuple[int, ...]] = []
-                for core in cores_list:
-                    if core not in seen:
-                        seen.add(core)
-                        unique_cores.append(core)
-
-                node_info = NodeInfo(
-                    id=node_id,
-                    memory=node_id in memory_nodes,
-                    cores_list=unique_cores,
-                    distance=distances,
-                )
-                nodes.append(node_info)
-
-            except (IOError, FileNotFoundError, ValueError) as e:
-                print(f"Warning: Could not read node {node_id} information: {str(e)}")
-                continue
+        with ThreadPoolExecutor(max_workers=_SYSFS_WORKERS) as ex:
+            results = ex.map(
+                lambda node_id: self._read_node(node_id, memory_nodes),
+                node_ids,
+            )
+            nodes = [node for node in results if node is not None]
 
         nodes.sort(key=lambda x: x.id)
         return nodes
 
+    def _read_node(self, node_id: int, memory_nodes: set[int]) -> NodeInfo | None:
+        """Reads the CPUs and distances of one NUMA node, or None if unreadable"""
+        try:
+            # Get CPU list for this node
+            cpus = _parse_cpu_ranges(
+                self._read_attr(f"{self.node_path_str}/node{node_id}/cpulist")
+            )
+
+            # Get distance matrix
+            distance_file = f"{self.node_path_str}/node{node_id}/distance"
+            distances = [int(i) for i in self._read_attr(distance_file).split()]
+
+            # Get logical IDs for each core (including SMT siblings); a CPU already
+            # listed as a sibling belongs to a core we have, so it is not re-read
+            cores_list: list[tuple[int, ...]] = []
+            visited: set[int] = set()
+            for core in cpus:
+                if core in visited:
+                    continue
+                siblings = self._get_cpus_logical_ids(core)
+                if siblings:
+                    visited.update(siblings)
+                    cores_list.append(tuple(siblings))
+
+            # Remove duplicates while preserving order
+            unique_cores = list(dict.fromkeys(cores_list))
+
+            return NodeInfo(
+                id=node_id,
+                memory=node_id in memory_nodes,
+                cores_list=unique_cores,
+                distance=distances,
+            )
+
+        except (IOError, FileNotFoundError, ValueError) as e:
+            print(f"Warning: Could not read node {node_id} information: {str(e)}")
+            return None
+
     def optimize_cache_nodes(self, node: NodeInfo, cache_level: int) -> NodeInfo:
         """
         Reorganizes cores in a node to group them by shared cache at the specified level.
@@ -250,27 +557,37 @@ class SystemTopology:
         if cache_level < 0:
             return node
 
-        cores_with_cache = []
+        # Common on single-socket parts: one cache at this level spans the whole node.
+        # Then every core has the same cache_id and the grouping is plain core order,
+        # which a single shared_cpu_list read proves without reading every core. The
+        # probe runs even when cache ids are memoized, so the result never depends on
+        # what was queried before.
+        cores = [core for core in node.cores_list if core]
+        if cores:
+            shared = self._read_shared_cpus(cores[0][0], cache_level)
+            if shared.issuperset(core[0] for core in cores):
+                node.cores_list = sorted(cores, key=lambda core: core[0])
+                return node
 
-        for core_tuple in node.cores_list:
-            if not core_tuple:
-                continue
+        cores_with_cache = []
 
+        for core_tuple in cores:
             cache_ids = self._get_cache_info(core_tuple[0])
 
-            if not cache_ids or cache_level >= len(cache_ids):
-                continue
-
+            # Like the shortcut above, every core is kept: one without an id at this
+            # level (a missing sysfs entry) goes after the grouped cores
             cores_with_cache.append(  # pyright: ignore[reportUnknownMemberType]
                 {
                     "core_tuple": core_tuple,
-                    "cache_id": cache_ids[cache_level],
+                    "cache_key": (0, cache_ids[cache_level])
+                    if cache_level < len(cache_ids)
+                    else (1, 0),
                     "first_logical_id": core_tuple[0],
                 }
             )
 
         # Sort by cache ID and then by first logical ID
-        cores_with_cache.sort(key=lambda x: (x["cache_id"], x["first_logical_id"]))  # pyright: ignore[reportUnknownMemberType, reportUnknownLambdaType]
+        cores_with_cache.sort(key=lambda x: (x["cache_key"], x["first_logical_id"]))  # pyright: ignore[reportUnknownMemberType, reportUnknownLambdaType]
 
         # Update the node's cores list
         node.cores_list = [core["core_tuple"] for core in cores_with_cache]  # pyright: ignore[reportUnknownVariableType]
@@ -296,26 +613,20 @@ class SystemTopology:
             return [nodes]
 
         # Create clusters with memory nodes
-        clusters: dict[str, list[NodeInfo]] = {
-            str(mem_node.id): [mem_node] for mem_node in memory_nodes
+        clusters: dict[int, list[NodeInfo]] = {
+            mem_node.id: [mem_node] for mem_node in memory_nodes
         }
 
-        # For each non-memory node, find closest memory node
+        # For each non-memory node, find closest memory node: an argmin over the
+        # memory ids its distance vector covers (ties go to the lowest id)
+        memory_ids = [mem_node.id for mem_node in memory_nodes]
         for node in nodes:
             if node.memory:
                 continue
 
-            min_dist = float("inf")
-            closest_mem_id: str | None = None
-
-            for mem_node in memory_nodes:
-                if mem_node.id < len(node.distance):
-                    dist = node.distance[mem_node.id]
-                    if dist < min_dist:
-                        min_dist = dist
-                        closest_mem_id = str(mem_node.id)
-
-            if closest_mem_id:
+            reachable = [i for i in memory_ids if i < len(node.distance)]
+            if reachable:
+                closest_mem_id = min(reachable, key=node.distance.__getitem__)
                 clusters[closest_mem_id].append(node)
 
         # Sort nodes in each cluster by distance to memory node
@@ -329,7 +640,7 @@ class SystemTopology:
                 key=lambda x: (
                     x.distance[memory_node.id]
                     if memory_node.id < len(x.distance)
-                    else float("inf")
+                    else sys.maxsize
                 ),
             )
 
@@ -343,38 +654,46 @@ class SystemTopology:
 
         return list(clusters.values())
 
-    def save_cluster_info(self, filename: str, cache_level: int = 3) -> bool:
-        """Saves CPU pinning information to a file."""
+    def save_cluster_info(
+        self,
+        filename: str,
+        cache_level: int = 3,
+        clusters: list[list[NodeInfo]] | None = None,
+    ) -> bool:
+        """
+        Saves CPU pinning information to a file.
+        Pass clusters already built with this cache_level to skip recomputing them.
+        """
         try:
-            clusters = self.get_clusters(optimize_cache_level=cache_level)
+            if clusters is None:
+                clusters = self.get_clusters(optimize_cache_level=cache_level)
 
             if not clusters:
                 print("Error: No clusters found")
                 return False
 
-            with open(filename, "w") as f:
-                _ = f.write("# CPU Pinning Configuration\n")
-                _ = f.write(f"# Generated on {os.uname().nodename}\n")
-                _ = f.write("# Format: core[cluster_id][node_id][core_id]=smt_list\n")
-                _ = f.write(f"# Cache optimization level: {cache_level}\n\n")
+            lines: list[str] = [
+                "# CPU Pinning Configuration\n",
+                f"# Generated on {_HOSTNAME}\n",
+                "# Format: core[cluster_id][node_id][core_id]=smt_list\n",
+                f"# Cache optimization level: {cache_level}\n\n",
+            ]
+
+            for cluster_idx, cluster in enumerate(clusters):
+                lines.append(f"# Cluster {cluster_idx} (Memory Node: {cluster[0].id})\n")
 
-                for cluster_idx, cluster in enumerate(clusters):
-                    _ = f.write(
-                        f"# Cluster {cluster_idx} (Memory Node: {cluster[0].id})\n"
+                for node_idx, node in enumerate(cluster):
+                    lines.append(
+                        f"# Node {node.id} ({'Memory' if node.memory else 'Compute'})\n"
                     )
 
-                    for node_idx, node in enumerate(cluster):
-                        _ = f.write(
-                            f"# Node {node.id} ({'Memory' if node.memory else 'Compute'})\n"
-                        )
+                    core_prefix = f"core[{cluster_idx}][{node_idx}]"
+                    for core_idx, cpus in enumerate(node.cores_list):
+                        if cpus:
+                            cpu_list = ",".join(map(str, cpus))
+                            lines.append(f"{core_prefix}[{core_idx}]={cpu_list}\n")
 
-                        for core_idx, cpus in enumerate(node.cores_list):
-                            if cpus:
-                                core_name = (
-                                    f"core[{cluster_idx}][{node_idx}][{core_idx}]"
-                                )
-                                cpu_list = ",".join(map(str, cpus))
-                                _ = f.write(f"{core_name}={cpu_list}\n")
+            _write_file(filename, "".join(lines))
 
             print(f"CPU pinning configuration saved to {filename}")
             return True
@@ -390,6 +709,37 @@ class CPUPinningGenerator:
     def __init__(self, topology: SystemTopology) -> None:
         self.topology: SystemTopology = topology
 
+    @staticmethod
+    def _smt_columns(
+        clusters: list[list[NodeInfo]],
+    ) -> tuple[int, list[list[list[list[int]]]]]:
+        """
+        Splits every node's cores by SMT position in a single pass.
+        Returns (max_smt, columns) where columns[cluster][node][smt_pos] lists the CPUs
+        at that SMT position in core order, so pinning strategies only concatenate.
+        """
+        max_smt = 0
+        columns: list[list[list[list[int]]]] = []
+        for cluster in clusters:
+            cluster_columns: list[list[list[int]]] = []
+            for node in cluster:
+                node_columns: list[list[int]] = []
+                for core in node.cores_list:
+                    for smt_pos, cpu in enumerate(core):
+                        if smt_pos == len(node_columns):
+                            node_columns.append([])
+                        node_columns[smt_pos].append(cpu)
+                max_smt = max(max_smt, len(node_columns))
+                cluster_columns.append(node_columns)
+            columns.append(cluster_columns)
+
+        # Nodes with narrower cores contribute nothing at the higher SMT positions
+        for cluster_columns in columns:
+            for node_columns in cluster_columns:
+                node_columns.extend([] for _ in range(max_smt - len(node_columns)))
+
+        return max_smt, columns
+
     def cluster_first_pinning(self, clusters: list[list[NodeInfo]]) -> list[int]:
         """
         Generates CPU pinning that fills clusters completely before moving to the next.
@@ -399,26 +749,13 @@ class CPUPinningGenerator:
             return []
 
         cpu_list: list[int] = []
+        max_smt, columns = self._smt_columns(clusters)
 
-        # Determine max SMT count
-        max_smt = max(
-            len(core)
-            for cluster in clusters
-            for node in cluster
-            for core in node.cores_list
-        )
-
-        # For each SMT position
+        # For each SMT position, every node of every cluster in order
         for smt_pos in range(max_smt):
-            # For each cluster
-            for cluster in clusters:
-                # For each node in the cluster
-                for node in cluster:
-                    # For each core in the node
-                    for core in node.cores_list:
-                        # If this core has this SMT position
-                        if smt_pos < len(core):
-                            cpu_list.append(core[smt_pos])
+            for cluster_columns in columns:
+                for node_columns in cluster_columns:
+                    cpu_list.extend(node_columns[smt_pos])
 
         return cpu_list
 
@@ -433,41 +770,24 @@ class CPUPinningGenerator:
             return []
 
         cpu_list: list[int] = []
-
-        # Determine max SMT count
-        max_smt = max(
-            len(core)
-            for cluster in clusters
-            for node in cluster
-            for core in node.cores_list
-        )
+        max_smt, columns = self._smt_columns(clusters)
 
         # For each SMT position
         for smt_pos in range(max_smt):
             # Track current position in each cluster
-            cluster_positions = [0] * len(clusters)
+            cluster_positions = [0] * len(columns)
 
             # Continue until all nodes are processed
             while any(
-                pos < len(cluster) for pos, cluster in zip(cluster_positions, clusters)
+                pos < len(cluster) for pos, cluster in zip(cluster_positions, columns)
             ):
-                # Process each cluster in round-robin
-                for cluster_idx, cluster in enumerate(clusters):
-                    nodes_processed = 0
-
-                    # Process up to nodes_per_round nodes from this cluster
-                    while nodes_processed < nodes_per_round and cluster_positions[
-                        cluster_idx
-                    ] < len(cluster):
-                        node = cluster[cluster_positions[cluster_idx]]
-
-                        # Add CPUs for current SMT position from this node
-                        for core in node.cores_list:
-                            if smt_pos < len(core):
-                                cpu_list.append(core[smt_pos])
-
-                        cluster_positions[cluster_idx] += 1
-                        nodes_processed += 1
+                # Take up to nodes_per_round nodes from each cluster in round-robin
+                for cluster_idx, cluster_columns in enumerate(columns):
+                    start = cluster_positions[cluster_idx]
+                    end = min(start + nodes_per_round, len(cluster_columns))
+                    for node_columns in cluster_columns[start:end]:
+                        cpu_list.extend(node_columns[smt_pos])
+                    cluster_positions[cluster_idx] = end
 
         return cpu_list
 
@@ -475,9 +795,7 @@ class CPUPinningGenerator:
     def save_pinning_to_file(filepath: str, pinning: list[int]) -> None:
         """Save CPU pinning list to a file"""
         try:
-            with open(filepath, "w") as file:
-                for cpu_id in pinning:
-                    _ = file.write(f"{cpu_id}\n")
+            _write_file(filepath, "".join(f"{cpu_id}\n" for cpu_id in pinning))
         except IOError as e:
             print(f"Error writing to {filepath}: {str(e)}")
             raise
@@ -579,7 +897,9 @@ Examples:
                     }
                     for cpu in cpu_info
                 ]
-                print(json.dumps(cpu_data, indent=2))
+                # Stream the encoding instead of building the whole document string
+                json.dump(cpu_data, sys.stdout, indent=2)
+                print()
             else:
                 print("CPU Layout Information:")
                 print_cpu_info(cpu_info)
@@ -600,7 +920,9 @@ Examples:
                     ]
                     for cluster in clusters
                 ]
-                print(json.dumps(cluster_data, indent=2))
+                # Stream the encoding instead of building the whole document string
+                json.dump(cluster_data, sys.stdout, indent=2)
+                print()
             else:
                 print_cluster_info(clusters, args.cache)  # pyright: ignore[reportAny]
 
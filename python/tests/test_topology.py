@@ -0,0 +1,379 @@
+"""Topology parsing against a fake sysfs tree, so no particular machine is assumed."""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import resource
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+from mpmc_bench.topology.generator import (
+    CPUPinningGenerator,
+    NodeInfo,
+    SystemTopology,
+    _atoi,
+    _parse_cpu_ranges,
+)
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text + "\n")
+
+
+@pytest.fixture(autouse=True)
+def _no_topology_cache(monkeypatch):
+    """A cache file from the caller's environment must not leak into (or out of) tests."""
+    monkeypatch.delenv("MPMC_TOPOLOGY_CACHE", raising=False)
+
+
+@pytest.fixture
+def sysfs(tmp_path: Path) -> Path:
+    """Two memory nodes with 2-way SMT; node1's cpulist mixes ranges and single ids."""
+    cpu, node = tmp_path / "cpu", tmp_path / "node"
+    layout = {0: "0-1,4-5", 1: "2,3,6-7"}
+    for n, cpulist in layout.items():
+        _write(node / f"node{n}" / "cpulist", cpulist)
+        _write(node / f"node{n}" / "distance", "10 20" if n == 0 else "20 10")
+    _write(node / "has_memory", "0-1")
+    for c in range(8):
+        core = c % 4
+        topo = cpu / f"cpu{c}" / "topology"
+        _write(topo / "thread_siblings_list", f"{core},{core + 4}")
+        _write(topo / "core_id", str(core))
+        _write(topo / "physical_package_id", "0")
+        _write(cpu / f"cpu{c}" / "cache" / "index0" / "id", str(core))
+        _write(cpu / f"cpu{c}" / "cache" / "index3" / "id", "0")
+        (cpu / f"cpu{c}" / f"node{0 if core < 2 else 1}").mkdir()
+    return tmp_path
+
+
+def _topology(root: Path) -> SystemTopology:
+    return SystemTopology(cpu_path=str(root / "cpu"), node_path=str(root / "node"))
+
+
+class TestRangeParsing:
+    def test_single_id(self):
+        assert _parse_cpu_ranges(b"3\n") == [3]
+
+    def test_plain_list(self):
+        assert _parse_cpu_ranges(b"0,4") == [0, 4]
+
+    def test_mixed_ranges_and_ids(self):
+        """The old parser split on '-' whenever one appeared, so this raised ValueError."""
+        assert _parse_cpu_ranges(b"0-2,8,10-11\n") == [0, 1, 2, 8, 10, 11]
+
+    def test_range_is_inclusive(self):
+        """has_memory '0-3' used to be read as the two ids {0, 3}."""
+        assert _parse_cpu_ranges(b"0-3") == [0, 1, 2, 3]
+
+    def test_empty_file(self):
+        """A memoryless or CPU-less node has an empty list, not an error."""
+        assert _parse_cpu_ranges(b"\n") == []
+
+
+def test_cache_id_takes_the_first_id_of_a_range():
+    assert _atoi(b"12\n") == 12
+    assert _atoi(b"0-1\n") == 0
+    with pytest.raises(ValueError):
+        _atoi(b"\n")
+
+
+def test_mixed_cpulist_node_is_not_dropped(sysfs):
+    nodes = _topology(sysfs).get_nodes_info()
+    assert [n.id for n in nodes] == [0, 1]
+    assert nodes[1].cores_list == [(2, 6), (3, 7)]
+
+
+def test_cpu_info_reads_every_cpu(sysfs):
+    cpus = _topology(sysfs).get_cpu_info()
+    assert [c.logical_id for c in cpus] == list(range(8))
+    assert cpus[5].siblings == [1, 5]
+    assert cpus[5].numa_node == 0
+    assert cpus[5].cache_ids == [1, 0]
+
+
+def test_repeated_queries_do_not_reread_sysfs(sysfs):
+    topo = _topology(sysfs)
+    first = topo.get_nodes_info()
+    (sysfs / "node" / "node1" / "cpulist").unlink()
+    assert topo.get_nodes_info() == first
+
+
+def test_editing_cpu_info_leaves_clustering_untouched(sysfs):
+    topo = _topology(sysfs)
+    for cpu in topo.get_cpu_info():
+        cpu.siblings.clear()
+        cpu.cache_ids[1:] = [-cpu.logical_id]  # would reverse the grouping
+        cpu.numa_node = None
+    assert topo.get_cpu_info()[5].siblings == [1, 5]
+    assert topo.get_nodes_info()[0].cores_list == [(0, 4), (1, 5)]
+    (node0,) = [n for n in topo.get_clusters(optimize_cache_level=1)[0] if n.id == 0]
+    assert node0.cores_list == [(0, 4), (1, 5)]
+
+
+def test_clustering_leaves_cached_nodes_untouched(sysfs):
+    """Cache optimization reorders cores_list; the cached sysfs order must survive."""
+    topo = _topology(sysfs)
+    before = topo.get_nodes_info()
+    topo.get_clusters(optimize_cache_level=0)
+    assert topo.get_nodes_info() == before
+
+
+def test_clustering_given_nodes_leaves_cached_nodes_untouched(sysfs):
+    """Nodes handed out by get_nodes_info are copies, so reordering them is harmless."""
+    for c in (1, 5):
+        _write(sysfs / "cpu" / f"cpu{c}" / "cache" / "index0" / "id", "0")
+    for c in (0, 4):
+        _write(sysfs / "cpu" / f"cpu{c}" / "cache" / "index0" / "id", "1")
+    topo = _topology(sysfs)
+    before = [node.cores_list for node in topo.get_nodes_info()]
+    (cluster,) = [c for c in topo.get_clusters(topo.get_nodes_info(), 0) if c[0].id == 0]
+    assert cluster[0].cores_list == [(1, 5), (0, 4)]
+    assert [node.cores_list for node in topo.get_nodes_info()] == before
+
+
+class TestTopologyCacheFile:
+    def test_round_trip(self, sysfs, tmp_path, monkeypatch):
+        monkeypatch.setenv("MPMC_TOPOLOGY_CACHE", str(tmp_path / "topo.json"))
+        cpus, nodes = _topology(sysfs).get_cpu_info(), _topology(sysfs).get_nodes_info()
+        for name in ("cpu", "node"):
+            (sysfs / name).rename(sysfs / f"{name}.gone")
+        reloaded = _topology(sysfs)
+        assert reloaded.get_cpu_info() == cpus
+        assert reloaded.get_nodes_info() == nodes
+
+    def test_other_host_is_ignored(self, sysfs, tmp_path, monkeypatch):
+        """A cache copied from another machine must not describe this one."""
+        cache = tmp_path / "topo.json"
+        monkeypatch.setenv("MPMC_TOPOLOGY_CACHE", str(cache))
+        topo = _topology(sysfs)
+        key = topo._cache_key()
+        cache.write_text(json.dumps({"key": ["elsewhere", *key[1:]], "cpus": []}))
+        assert len(_topology(sysfs).get_cpu_info()) == 8
+
+    def test_other_sysfs_root_is_ignored(self, sysfs, tmp_path, monkeypatch):
+        """A fake tree cached under the real hostname must not describe the real machine."""
+        monkeypatch.setenv("MPMC_TOPOLOGY_CACHE", str(tmp_path / "topo.json"))
+        _topology(sysfs).get_cpu_info()
+        other = tmp_path / "other"
+        (sysfs / "cpu").rename(other)
+        moved = SystemTopology(cpu_path=str(other), node_path=str(sysfs / "node"))
+        (other / "cpu7" / "topology" / "core_id").unlink()
+        assert len(moved.get_cpu_info()) == 7
+
+
+    def test_malformed_file_is_ignored_whole(self, sysfs, tmp_path, monkeypatch):
+        """Valid cpus next to a broken nodes entry must not leak into lookups."""
+        cache = tmp_path / "topo.json"
+        monkeypatch.setenv("MPMC_TOPOLOGY_CACHE", str(cache))
+        topo = _topology(sysfs)
+        bogus = [
+            {
+                "logical_id": c,
+                "core_id": c % 4,
+                "siblings": [c],
+                "numa_node": 7,
+                "cache_ids": [99],
+                "package_id": 0,
+            }
+            for c in range(8)
+        ]
+        cache.write_text(json.dumps({"key": topo._cache_key(), "cpus": bogus, "nodes": [{}]}))
+        cpus = _topology(sysfs).get_cpu_info()
+        assert [cpu.numa_node for cpu in cpus] == [0, 0, 1, 1, 0, 0, 1, 1]
+        assert cpus[5].cache_ids == [1, 0]
+
+
+def test_node_wide_cache_is_detected_from_one_core(sysfs, monkeypatch):
+    """When the first core's cache spans the node, other cores' cache dirs are not read."""
+    for c in (0, 1, 4, 5):
+        _write(sysfs / "cpu" / f"cpu{c}" / "cache" / "index3" / "shared_cpu_list", "0-7")
+    topo = _topology(sysfs)
+    (node0,) = [n for n in topo.get_nodes_info() if n.id == 0]
+    node0.cores_list.reverse()
+    read = []
+    monkeypatch.setattr(topo, "_read_cache_info", lambda cpu: read.append(cpu) or [])
+    assert topo.optimize_cache_nodes(node0, 1).cores_list == [(0, 4), (1, 5)]
+    assert read == []
+
+
+def test_cache_grouping_does_not_depend_on_earlier_queries(sysfs):
+    """A core missing its cache id is kept either way, and in the same place."""
+    for c in range(8):
+        _write(sysfs / "cpu" / f"cpu{c}" / "cache" / "index3" / "shared_cpu_list", "0-7")
+    (sysfs / "cpu" / "cpu1" / "cache" / "index3" / "id").unlink()
+    alone = _topology(sysfs).get_clusters(optimize_cache_level=1)
+    primed = _topology(sysfs)
+    primed.get_cpu_info()
+    assert primed.get_clusters(optimize_cache_level=1) == alone
+    assert alone[0][0].cores_list == [(0, 4), (1, 5)]
+
+
+def test_cores_without_a_cache_id_are_kept_last(sysfs):
+    (sysfs / "cpu" / "cpu0" / "cache" / "index3" / "id").unlink()
+    (node0,) = [n for n in _topology(sysfs).get_clusters(optimize_cache_level=1)[0] if n.id == 0]
+    assert node0.cores_list == [(1, 5), (0, 4)]
+
+
+def _open_fds() -> set[int]:
+    fds = set()
+    for fd in map(int, os.listdir("/proc/self/fd")):
+        try:
+            os.fstat(fd)  # drops the fd listdir itself had open
+        except OSError:
+            continue
+        fds.add(fd)
+    return fds
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc/self/fd")
+def test_kept_open_fds_see_changes_after_refresh_and_are_closed(sysfs):
+    topo = _topology(sysfs)
+    before = _open_fds()
+    with topo.open():
+        assert topo.get_cpu_info()[2].core_id == 2
+        kept = _open_fds() - before
+        assert kept
+        _write(sysfs / "cpu" / "cpu2" / "topology" / "core_id", "9")
+        topo.refresh()
+        assert topo.get_cpu_info()[2].core_id == 9
+        assert _open_fds() - before == kept  # re-read through the same fds
+    assert _open_fds() == before
+    for fd in kept:
+        with pytest.raises(OSError):
+            os.fstat(fd)
+
+
+def test_open_is_not_reentrant(sysfs):
+    topo = _topology(sysfs)
+    with topo.open():
+        with pytest.raises(RuntimeError):
+            with topo.open():
+                pass
+        assert topo.get_cpu_info()[2].core_id == 2
+    with topo.open():  # usable again once the block has exited
+        assert topo.get_cpu_info()[2].core_id == 2
+
+
+def _flat_sysfs(root: Path, n_cpus: int) -> Path:
+    """One node of @p n_cpus single-thread cores with two cache levels each."""
+    _write(root / "node" / "node0" / "cpulist", f"0-{n_cpus - 1}")
+    _write(root / "node" / "node0" / "distance", "10")
+    _write(root / "node" / "has_memory", "0")
+    for c in range(n_cpus):
+        topo = root / "cpu" / f"cpu{c}" / "topology"
+        _write(topo / "thread_siblings_list", str(c))
+        _write(topo / "core_id", str(c))
+        _write(topo / "physical_package_id", "0")
+        for index in range(2):
+            _write(root / "cpu" / f"cpu{c}" / "cache" / f"index{index}" / "id", str(c))
+        (root / "cpu" / f"cpu{c}" / "node0").mkdir()
+    return root
+
+
+@contextmanager
+def _nofile_soft_limit(spare: int):
+    """Lowers the soft RLIMIT_NOFILE to @p spare fds above those already open."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    open_fds = _open_fds()
+    # New fds take the lowest free numbers, so the limit sits just past the spare-th one
+    free = [fd for fd in range(max(open_fds) + spare + 1) if fd not in open_fds]
+    resource.setrlimit(resource.RLIMIT_NOFILE, (free[spare - 1] + 1, hard))
+    try:
+        yield
+    finally:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc/self/fd")
+def test_kept_open_fds_stay_under_the_fd_limit(tmp_path):
+    """Every CPU is read even when its attributes would not all fit in the fd limit."""
+    topo = _topology(_flat_sysfs(tmp_path, 96))
+    with _nofile_soft_limit(256), topo.open():
+        assert len(topo.get_cpu_info()) == 96
+        topo.refresh()
+        cpus = topo.get_cpu_info()
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        kept = len(_open_fds())
+    assert [cpu.cache_ids for cpu in cpus] == [[c, c] for c in range(96)]
+    assert kept <= soft
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc/self/fd")
+def test_running_out_of_fds_is_an_error(tmp_path):
+    """EMFILE used to be reported per CPU and the sweep returned the CPUs it managed."""
+    topo = _topology(_flat_sysfs(tmp_path, 8))
+    with _nofile_soft_limit(1), pytest.raises(RuntimeError, match="file descriptors"):
+        topo.get_cpu_info()
+
+
+def _reference_cluster_first(clusters):
+    """The original per-core walk the column split replaced."""
+    max_smt = max(len(core) for cl in clusters for node in cl for core in node.cores_list)
+    return [
+        core[smt]
+        for smt in range(max_smt)
+        for cl in clusters
+        for node in cl
+        for core in node.cores_list
+        if smt < len(core)
+    ]
+
+
+def _reference_ping_pong(clusters, per_round):
+    max_smt = max(len(core) for cl in clusters for node in cl for core in node.cores_list)
+    out = []
+    for smt in range(max_smt):
+        pos = [0] * len(clusters)
+        while any(p < len(cl) for p, cl in zip(pos, clusters)):
+            for i, cl in enumerate(clusters):
+                for node in cl[pos[i]:pos[i] + per_round]:
+                    out += [core[smt] for core in node.cores_list if smt < len(core)]
+                pos[i] = min(pos[i] + per_round, len(cl))
+    return out
+
+
+def _random_clusters(rng):
+    cpu, clusters = 0, []
+    for _ in range(rng.randint(1, 4)):
+        cluster = []
+        for node_id in range(rng.randint(1, 4)):
+            cores = []
+            for _ in range(rng.randint(1, 5)):
+                width = rng.randint(1, 4)  # uneven SMT widths, as on hybrid parts
+                cores.append(tuple(range(cpu, cpu + width)))
+                cpu += width
+            cluster.append(NodeInfo(node_id, node_id == 0, cores, [10]))
+        clusters.append(cluster)
+    return clusters
+
+
+class TestPinning:
+    def test_matches_the_per_core_walk(self):
+        rng = random.Random(1)
+        gen = CPUPinningGenerator(SystemTopology())
+        for _ in range(300):
+            clusters = _random_clusters(rng)
+            assert gen.cluster_first_pinning(clusters) == _reference_cluster_first(clusters)
+            for per_round in (1, 2, 3):
+                assert gen.ping_pong_pinning(clusters, per_round) == _reference_ping_pong(
+                    clusters, per_round
+                )
+
+    def test_reflects_clusters_reorganized_in_place(self, sysfs):
+        """Cache optimization reassigns cores_list on the same cluster lists."""
+        for c in (1, 5):
+            _write(sysfs / "cpu" / f"cpu{c}" / "cache" / "index0" / "id", "0")
+        for c in (0, 4):
+            _write(sysfs / "cpu" / f"cpu{c}" / "cache" / "index0" / "id", "1")
+        topo = _topology(sysfs)
+        gen = CPUPinningGenerator(topo)
+        clusters = topo.get_clusters()
+        assert gen.cluster_first_pinning(clusters)[:2] == [0, 1]
+        clusters[0][0] = topo.optimize_cache_nodes(clusters[0][0], 0)
+        assert gen.cluster_first_pinning(clusters)[:2] == [1, 0]